@@ -24,6 +24,12 @@ const noodlesConnections = new Set()
 const wss = new WebSocket.Server({
   port: PORT,
   clientTracking: true,
+  // Offer permessage-deflate so capable peers (the browser app, external
+  // clients) negotiate compression for large pipeline specs and
+  // screenshot frames; small control frames stay uncompressed
+  perMessageDeflate: {
+    threshold: 1024,
+  },
 })
 
 console.log(`WebSocket bridge server running on ws://localhost:${PORT}`)
@@ -45,24 +51,30 @@ wss.on('connection', (ws, req) => {
   }
 
   // Handle messages
-  ws.on('message', (data) => {
+  ws.on('message', (data, isBinary) => {
     try {
-      const message = JSON.parse(data.toString())
-      console.log('Received message:', message.type, message.id)
+      // Binary frames (e.g. MessagePack from the Python client) are routed
+      // opaquely; only text frames are parsed for logging
+      if (isBinary) {
+        console.log(`Received binary frame (${data.length} bytes)`)
+      } else {
+        const message = JSON.parse(data.toString())
+        console.log('Received message:', message.type, message.id)
+      }
 
       // Route messages between clients and Noodles
       if (isNoodles) {
         // Message from Noodles -> forward to external clients
         for (const client of clients) {
           if (client.readyState === WebSocket.OPEN) {
-            client.send(data)
+            client.send(data, { binary: isBinary })
           }
         }
       } else {
         // Message from external client -> forward to Noodles
         for (const noodles of noodlesConnections) {
           if (noodles.readyState === WebSocket.OPEN) {
-            noodles.send(data)
+            noodles.send(data, { binary: isBinary })
           }
         }
       }
@@ -25,6 +25,8 @@ describe('MessageType enum', () => {
     expect(MessageType.TOOL_CALL).toBe('tool_call')
     expect(MessageType.TOOL_RESPONSE).toBe('tool_response')
     expect(MessageType.TOOL_ERROR).toBe('tool_error')
+    expect(MessageType.BATCH).toBe('batch')
+    expect(MessageType.BATCH_RESPONSE).toBe('batch_response')
   })
 
   it('includes all project state types', () => {
@@ -82,6 +84,11 @@ describe('createMessage', () => {
     expect(msg.id).toBe('custom-id')
   })
 
+  it('preserves a numeric id of 0', () => {
+    const msg = createMessage(MessageType.PING, {}, 0)
+    expect(msg.id).toBe(0)
+  })
+
   it('generates timestamp close to current time', () => {
     const before = Date.now()
     const msg = createMessage(MessageType.PING, {})
@@ -165,16 +172,21 @@ describe('isValidMessage', () => {
     expect(isValidMessage({ id: 'test', timestamp: Date.now() })).toBe(false)
   })
 
-  it('returns false for missing timestamp', () => {
-    expect(isValidMessage({ id: 'test', type: MessageType.PING })).toBe(false)
+  it('accepts missing timestamp', () => {
+    expect(isValidMessage({ id: 'test', type: MessageType.PING })).toBe(true)
   })
 
   it('returns false for invalid type', () => {
     expect(isValidMessage({ id: 'test', type: 'invalid_type', timestamp: Date.now() })).toBe(false)
   })
 
-  it('returns false for non-string id', () => {
-    expect(isValidMessage({ id: 123, type: MessageType.PING, timestamp: Date.now() })).toBe(false)
+  it('accepts numeric ids', () => {
+    expect(isValidMessage({ id: 123, type: MessageType.PING, timestamp: Date.now() })).toBe(true)
+  })
+
+  it('returns false for non-string non-number id', () => {
+    expect(isValidMessage({ id: null, type: MessageType.PING, timestamp: Date.now() })).toBe(false)
+    expect(isValidMessage({ id: {}, type: MessageType.PING, timestamp: Date.now() })).toBe(false)
   })
 
   it('returns false for non-number timestamp', () => {
@@ -217,6 +229,16 @@ describe('parseMessage', () => {
   it('returns null for valid JSON but invalid message structure', () => {
     expect(parseMessage(JSON.stringify({ foo: 'bar' }))).toBeNull()
   })
+
+  it('stamps receive time when timestamp is omitted', () => {
+    const before = Date.now()
+    const parsed = parseMessage(JSON.stringify({ id: 1, type: MessageType.PING }))
+    const after = Date.now()
+
+    expect(parsed).not.toBeNull()
+    expect(parsed!.timestamp).toBeGreaterThanOrEqual(before)
+    expect(parsed!.timestamp).toBeLessThanOrEqual(after)
+  })
 })
 
 describe('serializeMessage', () => {
@@ -12,6 +12,8 @@ export enum MessageType {
   TOOL_CALL = 'tool_call',
   TOOL_RESPONSE = 'tool_response',
   TOOL_ERROR = 'tool_error',
+  BATCH = 'batch',
+  BATCH_RESPONSE = 'batch_response',
 
   // Project state
   STATE_CHANGE = 'state_change',
@@ -34,10 +36,16 @@ export enum MessageType {
   STATUS = 'status',
 }
 
+// Ids may be strings (browser-generated) or integers (external clients
+// using a monotonic counter, which is cheaper to generate and hash)
+export type MessageId = string | number
+
 export interface BaseMessage {
-  id: string
+  id: MessageId
   type: MessageType
-  timestamp: number
+  // Optional on the wire — external clients may omit it to save bytes
+  // and a clock read per message; parseMessage stamps receive time
+  timestamp?: number
 }
 
 export interface ConnectMessage extends BaseMessage {
@@ -79,6 +87,32 @@ export interface ToolErrorMessage extends BaseMessage {
   }
 }
 
+export interface BatchMessage extends BaseMessage {
+  type: MessageType.BATCH
+  payload: {
+    calls: Array<{
+      id: MessageId
+      tool: string
+      args: Record<string, unknown>
+    }>
+  }
+}
+
+export interface BatchResponseMessage extends BaseMessage {
+  type: MessageType.BATCH_RESPONSE
+  payload: {
+    results: Array<{
+      id: MessageId
+      result?: unknown
+      error?: {
+        message: string
+        code?: string
+      }
+    }>
+    executionTime: number
+  }
+}
+
 export interface StateChangeMessage extends BaseMessage {
   type: MessageType.STATE_CHANGE
   payload: {
@@ -149,6 +183,8 @@ export type Message =
   | ToolCallMessage
   | ToolResponseMessage
   | ToolErrorMessage
+  | BatchMessage
+  | BatchResponseMessage
   | StateChangeMessage
   | PipelineCreateMessage
   | PipelineTestMessage
@@ -160,10 +196,11 @@ export type Message =
 export const createMessage = <T extends Message>(
   type: MessageType,
   payload: unknown,
-  id?: string
+  id?: MessageId
 ): T => {
   return {
-    id: id || generateMessageId(),
+    // ?? not ||: 0 is a legitimate numeric id and must not be replaced
+    id: id ?? generateMessageId(),
     type,
     timestamp: Date.now(),
     payload,
@@ -204,9 +241,9 @@ export const isValidMessage = (data: unknown): data is Message => {
   return (
     typeof data === 'object' &&
     data !== null &&
-    typeof data.id === 'string' &&
+    (typeof data.id === 'string' || typeof data.id === 'number') &&
     typeof data.type === 'string' &&
-    typeof data.timestamp === 'number' &&
+    (data.timestamp === undefined || typeof data.timestamp === 'number') &&
     Object.values(MessageType).includes(data.type)
   )
 }
@@ -215,7 +252,14 @@ export const parseMessage = (data: string | ArrayBuffer): Message | null => {
   try {
     const text = typeof data === 'string' ? data : new TextDecoder().decode(data)
     const parsed = JSON.parse(text)
-    return isValidMessage(parsed) ? parsed : null
+    if (!isValidMessage(parsed)) {
+      return null
+    }
+    // Stamp receive time for messages that omitted the timestamp
+    if (parsed.timestamp === undefined) {
+      parsed.timestamp = Date.now()
+    }
+    return parsed
   } catch {
     return null
   }
@@ -228,7 +272,7 @@ export const serializeMessage = (message: Message): string => {
 // Response matcher for request-response patterns
 export class MessageMatcher {
   private pending = new Map<
-    string,
+    MessageId,
     {
       resolve: (msg: Message) => void
       reject: (error: Error) => void
@@ -236,7 +280,7 @@ export class MessageMatcher {
     }
   >()
 
-  waitForResponse(requestId: string, timeout = 30000): Promise<Message> {
+  waitForResponse(requestId: MessageId, timeout = 30000): Promise<Message> {
     return new Promise((resolve, reject) => {
       const timer = setTimeout(() => {
         this.pending.delete(requestId)
@@ -5,6 +5,8 @@ import { globalContextManager } from '../ai-chat/global-context-manager'
 import { MCPTools } from '../ai-chat/mcp-tools'
 import { getOpStore } from '../noodles/store'
 import {
+  type BatchMessage,
+  type BatchResponseMessage,
   createErrorMessage,
   createMessage,
   type DataUploadMessage,
@@ -119,6 +121,10 @@ const handleWorkerMessage = async (event: MessageEvent) => {
       await handleToolCall(message as ToolCallMessage)
       break
 
+    case MessageType.BATCH:
+      await handleBatch(message as BatchMessage)
+      break
+
     case MessageType.PIPELINE_CREATE:
       await handlePipelineCreate(message as PipelineCreateMessage)
       break
@@ -187,6 +193,45 @@ const handleToolCall = async (message: ToolCallMessage) => {
   }
 }
 
+// Handle a batch of tool calls in a single round-trip
+const handleBatch = async (message: BatchMessage) => {
+  if (!toolExecutor) {
+    sendToWorker(createErrorMessage('Tool executor not initialized', 'EXECUTOR_NOT_INITIALIZED'))
+    return
+  }
+
+  const { calls } = message.payload
+  const startTime = Date.now()
+  const results: BatchResponseMessage['payload']['results'] = []
+
+  // Execute sequentially so earlier calls are visible to later ones
+  for (const call of calls) {
+    try {
+      const result = await executeTool(toolExecutor, call.tool, call.args)
+      results.push({ id: call.id, result })
+    } catch (error) {
+      results.push({
+        id: call.id,
+        error: {
+          message: error instanceof Error ? error.message : String(error),
+          code: 'TOOL_EXECUTION_ERROR',
+        },
+      })
+    }
+  }
+
+  sendToWorker(
+    createMessage(
+      MessageType.BATCH_RESPONSE,
+      {
+        results,
+        executionTime: Date.now() - startTime,
+      },
+      message.id
+    )
+  )
+}
+
 // Execute a tool from MCPTools
 const executeTool = async (
   executor: MCPTools,